@@ -9,7 +9,24 @@ optimizer = dict(
     type='Adam',
     lr=0.0015,
 )
+# use the fused single-kernel Adam step (PyTorch >= 2.0, CUDA only)
+fused_optimizer = True
 optimizer_config = dict(grad_clip=None)
+
+# fp16 settings
+fp16 = dict(loss_scale='dynamic')
+
+# compile backbone, neck and head with torch.compile (PyTorch >= 2.0).
+# The input size varies with the image size during evaluation, so CUDA
+# graphs, which record one graph per input size, are disabled and the
+# static 512x512 training graph is left to the default shape handling
+compile = dict(mode='max-autotune-no-cudagraphs')
+# tools/test.py runs in eager mode to avoid recompiling for every image size
+compile_eval = False
+
+# allow TF32 matmul/conv on Ampere or newer GPUs
+allow_tf32 = True
+
 # learning policy
 lr_config = dict(
     policy='step',
@@ -44,6 +61,7 @@ model = dict(
     type='AssociativeEmbedding',
     pretrained='https://download.openmmlab.com/mmpose/'
     'pretrain_models/hrnet_w48-8ef0771d.pth',
+    channels_last=True,
     backbone=dict(
         type='HRNet',
         in_channels=3,
@@ -161,10 +179,15 @@ test_pipeline = val_pipeline
 
 data_root = 'data/coco'
 data = dict(
-    workers_per_gpu=2,
+    # workers per GPU (rank); keep workers_per_gpu * GPUs per node within
+    # $SLURM_CPUS_PER_TASK, e.g. --cfg-options data.workers_per_gpu=4
+    workers_per_gpu=8,
+    pin_memory=True,
+    prefetch_factor=4,
+    persistent_workers=True,
     train_dataloader=dict(samples_per_gpu=16),
-    val_dataloader=dict(samples_per_gpu=1),
-    test_dataloader=dict(samples_per_gpu=1),
+    val_dataloader=dict(samples_per_gpu=1, workers_per_gpu=4),
+    test_dataloader=dict(samples_per_gpu=1, workers_per_gpu=4),
     train=dict(
         type='BottomUpCocoDataset',
         ann_file=f'{data_root}/annotations/person_keypoints_train2017.json',
@@ -8,8 +8,26 @@ optimizer = dict(
     type='Adam',
     lr=5e-3,
 )
+# use the fused single-kernel Adam step (PyTorch >= 2.0, CUDA only)
+fused_optimizer = True
 
 optimizer_config = dict(grad_clip=None)
+
+# fp16 settings
+fp16 = dict(loss_scale='dynamic')
+
+# compile backbone, neck and head with torch.compile (PyTorch >= 2.0)
+compile = dict(mode='max-autotune', dynamic=False)
+
+# the input size is fixed, let cuDNN pick the fastest conv algorithms
+cudnn_benchmark = True
+# allow TF32 matmul/conv on Ampere or newer GPUs
+allow_tf32 = True
+
+# every stage contributes to the loss, so DDP does not need to search for
+# unused parameters
+find_unused_parameters = False
+
 # learning policy
 lr_config = dict(
     policy='step',
@@ -53,15 +71,14 @@ model = dict(
         num_units=4,
         use_prm=False,
         norm_cfg=dict(type='BN'),
-        loss_keypoint=([
-            dict(
-                type='JointsMSELoss', use_target_weight=True, loss_weight=0.25)
-        ] * 3 + [
-            dict(
-                type='JointsOHKMMSELoss',
-                use_target_weight=True,
-                loss_weight=1.)
-        ]) * 4),
+        # equivalent to ([JointsMSELoss(loss_weight=0.25)] * 3 +
+        # [JointsOHKMMSELoss(loss_weight=1.)]) * 4, fused into one call
+        loss_keypoint=dict(
+            type='JointsMultiStageMSELoss',
+            use_target_weight=True,
+            stage_weights=([0.25] * 3 + [1.]) * 4,
+            ohkm_stages=[3, 7, 11, 15],
+            topk=8)),
     train_cfg=dict(),
     test_cfg=dict(
         flip_test=True,
@@ -144,10 +161,16 @@ data_root = 'data/coco'
 data = dict(
     samples_per_gpu=32,
     workers_per_gpu=4,
+    pin_memory=True,
+    prefetch_factor=4,
+    persistent_workers=True,
     train=dict(
         type='TopDownCocoDataset',
         ann_file=f'{data_root}/annotations/person_keypoints_train2017.json',
         img_prefix=f'{data_root}/train2017/',
+        # decoded samples are cached here after the first run; keep it out
+        # of the (possibly read-only) data root
+        ann_cache='work_dirs/ann_cache/coco_person_keypoints_train2017.pkl',
         data_cfg=data_cfg,
         pipeline=train_pipeline,
         dataset_info={{_base_.dataset_info}}),
@@ -8,7 +8,25 @@ optimizer = dict(
     type='Adam',
     lr=5e-4,
 )
+# use the fused single-kernel Adam step (PyTorch >= 2.0, CUDA only)
+fused_optimizer = True
 optimizer_config = dict(grad_clip=None)
+
+# fp16 settings
+fp16 = dict(loss_scale='dynamic')
+
+# compile backbone, neck and head with torch.compile (PyTorch >= 2.0)
+compile = dict(mode='max-autotune', dynamic=False)
+
+# the input size is fixed, let cuDNN pick the fastest conv algorithms
+cudnn_benchmark = True
+# allow TF32 matmul/conv on Ampere or newer GPUs
+allow_tf32 = True
+
+# every stage contributes to the loss, so DDP does not need to search for
+# unused parameters
+find_unused_parameters = False
+
 # learning policy
 lr_config = dict(
     policy='step',
@@ -107,9 +125,14 @@ test_pipeline = val_pipeline
 data_root = 'data/mpii'
 data = dict(
     samples_per_gpu=64,
-    workers_per_gpu=2,
-    val_dataloader=dict(samples_per_gpu=32),
-    test_dataloader=dict(samples_per_gpu=32),
+    # workers per GPU (rank); keep workers_per_gpu * GPUs per node within
+    # $SLURM_CPUS_PER_TASK, e.g. --cfg-options data.workers_per_gpu=4
+    workers_per_gpu=8,
+    pin_memory=True,
+    prefetch_factor=4,
+    persistent_workers=True,
+    val_dataloader=dict(samples_per_gpu=32, workers_per_gpu=4),
+    test_dataloader=dict(samples_per_gpu=32, workers_per_gpu=4),
     train=dict(
         type='TopDownMpiiDataset',
         ann_file=f'{data_root}/annotations/mpii_train.json',
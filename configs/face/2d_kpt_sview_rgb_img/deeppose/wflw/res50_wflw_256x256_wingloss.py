@@ -9,6 +9,14 @@ optimizer = dict(
     lr=5e-4,
 )
 optimizer_config = dict(grad_clip=None)
+
+# compile backbone and head with torch.compile (PyTorch >= 2.0); the input
+# size is fixed, so CUDA graphs can be used to cut the kernel launch overhead
+compile = dict(mode='reduce-overhead', dynamic=False)
+# tools/test.py compiles once for the fixed evaluation shape, so the longer
+# autotuning of max-autotune pays off there
+compile_eval = dict(mode='max-autotune', dynamic=False)
+
 # learning policy
 lr_config = dict(
     policy='step',
@@ -36,6 +44,7 @@ channel_cfg = dict(
 model = dict(
     type='TopDown',
     pretrained='torchvision://resnet50',
+    channels_last=True,
     backbone=dict(type='ResNet', depth=50, num_stages=4, out_indices=(3, )),
     neck=dict(type='GlobalAveragePooling'),
     keypoint_head=dict(
@@ -57,14 +66,13 @@ data_cfg = dict(
 train_pipeline = [
     dict(type='LoadImageFromFile'),
     dict(type='TopDownGetBboxCenterScale', padding=1.25),
-    dict(type='TopDownRandomFlip', flip_prob=0.5),
+    dict(type='TopDownRandomFlip', flip_prob=0.5, defer_img_flip=True),
     dict(
         type='TopDownGetRandomScaleRotation', rot_factor=30,
         scale_factor=0.25),
     dict(type='TopDownAffine'),
-    dict(type='ToTensor'),
     dict(
-        type='NormalizeTensor',
+        type='NormalizeLUT',
         mean=[0.485, 0.456, 0.406],
         std=[0.229, 0.224, 0.225]),
     dict(type='TopDownGenerateTargetRegression'),
@@ -81,9 +89,8 @@ val_pipeline = [
     dict(type='LoadImageFromFile'),
     dict(type='TopDownGetBboxCenterScale', padding=1.25),
     dict(type='TopDownAffine'),
-    dict(type='ToTensor'),
     dict(
-        type='NormalizeTensor',
+        type='NormalizeLUT',
         mean=[0.485, 0.456, 0.406],
         std=[0.229, 0.224, 0.225]),
     dict(
@@ -97,7 +104,12 @@ test_pipeline = val_pipeline
 data_root = 'data/wflw'
 data = dict(
     samples_per_gpu=64,
-    workers_per_gpu=2,
+    # workers per GPU (rank), derived from the CPUs available to each rank
+    # (at most 8); override with e.g. --cfg-options data.workers_per_gpu=4
+    workers_per_gpu='auto',
+    pin_memory=True,
+    prefetch_factor=4,
+    persistent_workers=True,
     val_dataloader=dict(samples_per_gpu=32),
     test_dataloader=dict(samples_per_gpu=32),
     train=dict(
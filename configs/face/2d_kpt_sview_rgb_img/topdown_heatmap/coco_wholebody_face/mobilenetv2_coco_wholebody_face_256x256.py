@@ -9,7 +9,18 @@ optimizer = dict(
     type='Adam',
     lr=2e-3,
 )
+# use the fused single-kernel Adam step (PyTorch >= 2.0, CUDA only)
+fused_optimizer = True
 optimizer_config = dict(grad_clip=None)
+
+# compile backbone, neck and head with torch.compile (PyTorch >= 2.0)
+compile = dict(mode='max-autotune', dynamic=False)
+
+# the input size is fixed, let cuDNN pick the fastest conv algorithms
+cudnn_benchmark = True
+# allow TF32 matmul/conv on Ampere or newer GPUs
+allow_tf32 = True
+
 # learning policy
 lr_config = dict(
     policy='step',
@@ -102,9 +113,14 @@ test_pipeline = val_pipeline
 data_root = 'data/coco'
 data = dict(
     samples_per_gpu=32,
-    workers_per_gpu=2,
-    val_dataloader=dict(samples_per_gpu=32),
-    test_dataloader=dict(samples_per_gpu=32),
+    # workers per GPU (rank); keep workers_per_gpu * GPUs per node within
+    # $SLURM_CPUS_PER_TASK, e.g. --cfg-options data.workers_per_gpu=4
+    workers_per_gpu=8,
+    pin_memory=True,
+    prefetch_factor=4,
+    persistent_workers=True,
+    val_dataloader=dict(samples_per_gpu=32, workers_per_gpu=4),
+    test_dataloader=dict(samples_per_gpu=32, workers_per_gpu=4),
     train=dict(
         type='FaceCocoWholeBodyDataset',
         ann_file=f'{data_root}/annotations/coco_wholebody_train_v1.0.json',
@@ -13,7 +13,7 @@ from mmcv.utils import digit_version
 from mmpose.core import DistEvalHook, EvalHook, build_optimizers
 from mmpose.core.distributed_wrapper import DistributedDataParallelWrapper
 from mmpose.datasets import build_dataloader, build_dataset
-from mmpose.utils import get_root_logger
+from mmpose.utils import compile_model, get_root_logger
 
 try:
     from mmcv.runner import Fp16OptimizerHook
@@ -99,6 +99,7 @@ def train_model(model,
                    'seed',
                    'drop_last',
                    'prefetch_num',
+                   'prefetch_factor',
                    'pin_memory',
                    'persistent_workers',
                ] if k in cfg.data)
@@ -112,6 +113,9 @@ def train_model(model,
     # determine whether use adversarial training precess or not
     use_adverserial_train = cfg.get('use_adversarial_train', False)
 
+    # compile the model graph with torch.compile if required
+    model = compile_model(model, cfg.get('compile', False))
+
     # put model on gpus
     if distributed:
         find_unused_parameters = cfg.get('find_unused_parameters', True)
@@ -142,7 +146,17 @@ def train_model(model,
                 'details.')
 
     # build runner
-    optimizer = build_optimizers(model, cfg.optimizer)
+    optimizer_cfg = cfg.optimizer
+    if cfg.get('fused_optimizer', False):
+        # the fused Adam/AdamW kernels need PyTorch >= 2.0 and CUDA params
+        if (digit_version(torch.__version__) >= digit_version('2.0.0')
+                and torch.cuda.is_available()):
+            optimizer_cfg = optimizer_cfg.copy()
+            optimizer_cfg['fused'] = True
+        else:
+            warnings.warn('fused_optimizer requires PyTorch >= 2.0 and '
+                          'CUDA, falling back to the default optimizer.')
+    optimizer = build_optimizers(model, optimizer_cfg)
 
     runner = EpochBasedRunner(
         model,
@@ -199,7 +213,12 @@ def train_model(model,
             num_gpus=len(cfg.gpu_ids),
             dist=distributed,
             drop_last=False,
-            shuffle=False)
+            shuffle=False,
+            **dict((k, cfg.data[k]) for k in [
+                'prefetch_factor',
+                'pin_memory',
+                'persistent_workers',
+            ] if k in cfg.data))
         dataloader_setting = dict(dataloader_setting,
                                   **cfg.data.get('val_dataloader', {}))
         val_dataloader = build_dataloader(val_dataset, **dataloader_setting)
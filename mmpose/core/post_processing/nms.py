@@ -70,19 +70,27 @@ def oks_iou(g, d, a_g, a_d, sigmas=None, vis_thr=None):
     vars = (sigmas * 2)**2
     xg = g[0::3]
     yg = g[1::3]
-    vg = g[2::3]
+    xd = d[:, 0::3]
+    yd = d[:, 1::3]
+    vd = d[:, 2::3]
+    dx = xd - xg
+    dy = yd - yg
+    e = (dx**2 + dy**2) / vars / ((a_g + a_d[:, None]) / 2 + np.spacing(1)) / 2
+    oks = np.exp(-e)
+    if vis_thr is not None:
+        # only the visibility of detected keypoints is taken into account
+        valid = vd > vis_thr
+        oks = np.where(valid, oks, 0)
+        num_valid = valid.sum(axis=1)
+    else:
+        num_valid = np.full(len(d), e.shape[1])
     ious = np.zeros(len(d), dtype=np.float32)
-    for n_d in range(0, len(d)):
-        xd = d[n_d, 0::3]
-        yd = d[n_d, 1::3]
-        vd = d[n_d, 2::3]
-        dx = xd - xg
-        dy = yd - yg
-        e = (dx**2 + dy**2) / vars / ((a_g + a_d[n_d]) / 2 + np.spacing(1)) / 2
-        if vis_thr is not None:
-            ind = list(vg > vis_thr) and list(vd > vis_thr)
-            e = e[ind]
-        ious[n_d] = np.sum(np.exp(-e)) / len(e) if len(e) != 0 else 0.0
+    np.divide(
+        oks.sum(axis=1),
+        num_valid,
+        out=ious,
+        where=num_valid != 0,
+        casting='unsafe')
     return ious
 
 
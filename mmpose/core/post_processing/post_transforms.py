@@ -4,6 +4,7 @@
 # ------------------------------------------------------------------------------
 
 import math
+from functools import lru_cache
 
 import cv2
 import numpy as np
@@ -135,18 +136,28 @@ def flip_back(output_flipped, flip_pairs, target_type='GaussianHeatmap'):
         output_flipped[:, 1::3, ...] = -output_flipped[:, 1::3, ...]
     output_flipped = output_flipped.reshape(shape_ori[0], -1, channels,
                                             shape_ori[2], shape_ori[3])
-    output_flipped_back = output_flipped.copy()
 
     # Swap left-right parts
-    for left, right in flip_pairs:
-        output_flipped_back[:, left, ...] = output_flipped[:, right, ...]
-        output_flipped_back[:, right, ...] = output_flipped[:, left, ...]
+    flip_index = _get_flip_index(output_flipped.shape[1],
+                                 tuple(map(tuple, flip_pairs)))
+    output_flipped_back = np.take(output_flipped, flip_index, axis=1)
     output_flipped_back = output_flipped_back.reshape(shape_ori)
     # Flip horizontally
     output_flipped_back = output_flipped_back[..., ::-1]
     return output_flipped_back
 
 
+@lru_cache(maxsize=None)
+def _get_flip_index(num_keypoints, flip_pairs):
+    """Get the keypoint permutation that swaps left-right parts, cached for
+    each ``flip_pairs``."""
+    flip_index = np.arange(num_keypoints)
+    for left, right in flip_pairs:
+        flip_index[left] = right
+        flip_index[right] = left
+    return flip_index
+
+
 def transform_preds(coords, center, scale, output_size, use_udp=False):
     """Get final keypoint predictions from heatmaps and apply scaling and
     translation to map them back to the image.
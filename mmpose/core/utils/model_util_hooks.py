@@ -1,5 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from mmcv.runner import HOOKS, Hook
+import torch
+from mmcv.runner import HOOKS, EMAHook, Hook
 
 
 @HOOKS.register_module()
@@ -11,3 +12,41 @@ class ModelSetEpochHook(Hook):
 
     def before_epoch(self, runner):
         runner.model.module.set_train_epoch(runner.epoch + 1)
+
+
+@HOOKS.register_module()
+class ForeachEMAHook(EMAHook):
+    """Exponential Moving Average Hook with multi-tensor updates.
+
+    Same as :class:`mmcv.runner.EMAHook`, but all ema parameters are updated
+    with ``torch._foreach_*`` ops in a few kernel launches, instead of two
+    in-place ops per parameter.
+
+    Args:
+        momentum (float): The momentum used for updating ema parameter.
+            Defaults to 0.0002.
+        interval (int): Update ema parameter every interval iteration.
+            Defaults to 1.
+        warm_up (int): During first warm_up steps, we may use smaller momentum
+            to update ema parameters more slowly. Defaults to 100.
+        resume_from (str, optional): The checkpoint path. Defaults to None.
+    """
+
+    def before_run(self, runner):
+        super().before_run(runner)
+        self.params = [value.data for value in self.model_parameters.values()]
+        self.ema_params = [
+            self.model_buffers[self.param_ema_buffer[name]]
+            for name in self.model_parameters
+        ]
+
+    def after_train_iter(self, runner):
+        """Update ema parameter every self.interval iterations."""
+        curr_step = runner.iter
+        # We warm up the momentum considering the instability at beginning
+        momentum = min(self.momentum,
+                       (1 + curr_step) / (self.warm_up + curr_step))
+        if curr_step % self.interval != 0:
+            return
+        torch._foreach_mul_(self.ema_params, 1 - momentum)
+        torch._foreach_add_(self.ema_params, self.params, alpha=momentum)
@@ -1,9 +1,11 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import copy
+import os
 import platform
 import random
 from functools import partial
 
+import cv2
 import numpy as np
 import torch
 from mmcv.parallel import collate
@@ -107,8 +109,11 @@ def build_dataloader(dataset,
         dataset (Dataset): A PyTorch dataset.
         samples_per_gpu (int): Number of training samples on each GPU, i.e.,
             batch size of each GPU.
-        workers_per_gpu (int): How many subprocesses to use for data loading
-            for each GPU.
+        workers_per_gpu (int | str): How many subprocesses to use for data
+            loading for each GPU. In distributed training this is per process
+            (rank), so a node spawns ``workers_per_gpu * num_gpus_per_node``
+            workers. ``'auto'`` derives it from the CPUs available to this
+            process, see :func:`get_auto_workers_per_gpu`.
         num_gpus (int): Number of GPUs. Only used in non-distributed training.
         dist (bool): Distributed training/test or not. Default: True.
         shuffle (bool): Whether to shuffle the data at every epoch.
@@ -123,6 +128,8 @@ def build_dataloader(dataset,
         DataLoader: A PyTorch dataloader.
     """
     rank, world_size = get_dist_info()
+    if workers_per_gpu == 'auto':
+        workers_per_gpu = get_auto_workers_per_gpu(num_gpus, dist)
     if dist:
         sampler = DistributedSampler(
             dataset, world_size, rank, shuffle=shuffle, seed=seed)
@@ -135,8 +142,7 @@ def build_dataloader(dataset,
         num_workers = num_gpus * workers_per_gpu
 
     init_fn = partial(
-        worker_init_fn, num_workers=num_workers, rank=rank,
-        seed=seed) if seed is not None else None
+        worker_init_fn, num_workers=num_workers, rank=rank, seed=seed)
 
     _, DataLoader = _get_dataloader()
     data_loader = DataLoader(
@@ -154,8 +160,50 @@ def build_dataloader(dataset,
     return data_loader
 
 
+def get_auto_workers_per_gpu(num_gpus=1, dist=True, max_workers=8):
+    """Get the number of dataloader workers per GPU from the CPUs available
+    to this process.
+
+    The CPUs in the affinity mask of the process (which respects cgroup and
+    SLURM allocations) are shared by all processes (ranks) of the node in
+    distributed mode, or by all GPUs otherwise. One CPU of each share is left
+    to the main process.
+
+    Args:
+        num_gpus (int): Number of GPUs. Only used in non-distributed mode.
+            Default: 1.
+        dist (bool): Distributed training/test or not. Default: True.
+        max_workers (int): Upper bound of the workers per GPU. Default: 8.
+
+    Returns:
+        int: The number of workers per GPU, at least 1.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        num_cpus = len(os.sched_getaffinity(0))
+    else:
+        num_cpus = os.cpu_count() or 1
+
+    if dist:
+        # number of processes (ranks) on this node, set by torchrun
+        _, world_size = get_dist_info()
+        num_shares = int(
+            os.environ.get('LOCAL_WORLD_SIZE',
+                           min(world_size, max(torch.cuda.device_count(), 1))))
+    else:
+        num_shares = num_gpus
+
+    return max(1, min(num_cpus // max(num_shares, 1) - 1, max_workers))
+
+
 def worker_init_fn(worker_id, num_workers, rank, seed):
-    """Init the random seed for various workers."""
+    """Init the random seed and the threads for various workers."""
+    # Each worker is a separate process, so let it run single-threaded to
+    # avoid oversubscribing the CPU cores. Settings of the main process are
+    # not inherited when workers are started with `spawn`.
+    torch.set_num_threads(1)
+    cv2.setNumThreads(0)
+    if seed is None:
+        return
     # The seed of each worker equals to
     # num_worker * rank + worker_id + user_seed
     worker_seed = num_workers * rank + worker_id + seed
@@ -137,23 +137,22 @@ class Kpt2dSviewRgbImgBottomUpDataset(Dataset, metaclass=ABCMeta):
         coco = self.coco
         img_info = coco.loadImgs(self.img_ids[idx])[0]
 
-        m = np.zeros((img_info['height'], img_info['width']), dtype=np.float32)
-
+        rles = []
         for obj in anno:
             if 'segmentation' in obj:
-                if obj['iscrowd']:
+                if obj['iscrowd'] or obj['num_keypoints'] == 0:
                     rle = xtcocotools.mask.frPyObjects(obj['segmentation'],
                                                        img_info['height'],
                                                        img_info['width'])
-                    m += xtcocotools.mask.decode(rle)
-                elif obj['num_keypoints'] == 0:
-                    rles = xtcocotools.mask.frPyObjects(
-                        obj['segmentation'], img_info['height'],
-                        img_info['width'])
-                    for rle in rles:
-                        m += xtcocotools.mask.decode(rle)
-
-        return m < 0.5
+                    rles.extend(rle if isinstance(rle, list) else [rle])
+
+        if len(rles) == 0:
+            return np.ones((img_info['height'], img_info['width']), dtype=bool)
+
+        # merge the ignored regions in RLE format and decode only once
+        m = xtcocotools.mask.decode(xtcocotools.mask.merge(rles))
+
+        return m == 0
 
     @abstractmethod
     def _get_single(self, idx):
@@ -1,12 +1,15 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import os
 import os.path as osp
 import tempfile
 import warnings
 from collections import OrderedDict, defaultdict
 
 import json_tricks as json
+import mmcv
 import numpy as np
 from mmcv import Config, deprecated_api_warning
+from xtcocotools.coco import COCO
 from xtcocotools.cocoeval import COCOeval
 
 from ....core.post_processing import oks_nms, soft_oks_nms
@@ -54,15 +57,29 @@ class TopDownCocoDataset(Kpt2dSviewRgbImgTopDownDataset):
         dataset_info (DatasetInfo): A class containing all dataset info.
         test_mode (bool): Store True when building test or
             validation dataset. Default: False.
+        ann_cache (str, optional): Path to a pickle file caching the decoded
+            sample list (``self.db``) and the image index. It is written on
+            the first load and reused afterwards as long as the annotation
+            and bbox files are unchanged and the dataset settings match. On a
+            cache hit the annotation file is not parsed, and the COCO api is
+            only built when first accessed, e.g. for evaluation. The cache
+            should be in a writable location such as the work directory.
+            Default: None.
     """
 
+    # attributes derived from the COCO api that are stored in the cache
+    _cached_attrs = ('classes', 'num_classes', '_class_to_ind',
+                     '_class_to_coco_ind', '_coco_ind_to_class_ind', 'img_ids',
+                     'num_images', 'id2name', 'name2id')
+
     def __init__(self,
                  ann_file,
                  img_prefix,
                  data_cfg,
                  pipeline,
                  dataset_info=None,
-                 test_mode=False):
+                 test_mode=False,
+                 ann_cache=None):
 
         if dataset_info is None:
             warnings.warn(
@@ -72,12 +89,21 @@ class TopDownCocoDataset(Kpt2dSviewRgbImgTopDownDataset):
             cfg = Config.fromfile('configs/_base_/datasets/coco.py')
             dataset_info = cfg._cfg_dict['dataset_info']
 
+        cache = None
+        if ann_cache is not None:
+            cache_meta = self._get_cache_meta(ann_file, img_prefix, data_cfg,
+                                              dataset_info, test_mode)
+            cache = self._load_ann_cache(ann_cache, cache_meta)
+
+        # on a cache hit, the annotation file is not parsed here
+        self._coco = None
         super().__init__(
             ann_file,
             img_prefix,
             data_cfg,
             pipeline,
             dataset_info=dataset_info,
+            coco_style=cache is None,
             test_mode=test_mode)
 
         self.use_gt_bbox = data_cfg['use_gt_bbox']
@@ -89,7 +115,14 @@ class TopDownCocoDataset(Kpt2dSviewRgbImgTopDownDataset):
         self.oks_thr = data_cfg['oks_thr']
         self.vis_thr = data_cfg['vis_thr']
 
-        self.db = self._get_db()
+        if cache is not None:
+            for name, value in cache['attrs'].items():
+                setattr(self, name, value)
+            self.db = cache['db']
+        else:
+            self.db = self._get_db()
+            if ann_cache is not None:
+                self._dump_ann_cache(ann_cache, cache_meta)
 
         print(f'=> num_images: {self.num_images}')
         print(f'=> load {len(self.db)} samples')
@@ -104,6 +137,88 @@ class TopDownCocoDataset(Kpt2dSviewRgbImgTopDownDataset):
             gt_db = self._load_coco_person_detection_results()
         return gt_db
 
+    @property
+    def coco(self):
+        """COCO api of the annotation file.
+
+        It is built on first access if the samples were loaded from the
+        annotation cache.
+        """
+        if getattr(self, '_coco', None) is None:
+            self._coco = COCO(self.ann_file)
+        return self._coco
+
+    @coco.setter
+    def coco(self, coco):
+        self._coco = coco
+
+    @staticmethod
+    def _get_file_stat(filename):
+        """Get the absolute path, size and modification time of a file."""
+        stat = os.stat(filename)
+        return osp.abspath(filename), stat.st_size, stat.st_mtime_ns
+
+    def _get_cache_meta(self, ann_file, img_prefix, data_cfg, dataset_info,
+                        test_mode):
+        """Get the settings that the cached samples depend on."""
+        meta = dict(
+            dataset_type=type(self).__name__,
+            ann_file=self._get_file_stat(ann_file),
+            bbox_file=None,
+            det_bbox_thr=None,
+            img_prefix=img_prefix,
+            dataset_name=dataset_info.get('dataset_name'),
+            num_joints=data_cfg['num_joints'])
+        if test_mode and not data_cfg['use_gt_bbox']:
+            # use bbox from detection
+            meta['bbox_file'] = self._get_file_stat(data_cfg['bbox_file'])
+            meta['det_bbox_thr'] = data_cfg.get('det_bbox_thr', 0.0)
+        return meta
+
+    @staticmethod
+    def _load_ann_cache(cache_file, meta):
+        """Load the annotation cache, or return None if it is missing or was
+        built from other annotations or settings."""
+        if not osp.exists(cache_file):
+            return None
+        try:
+            cache = mmcv.load(cache_file, file_format='pkl')
+        except Exception as e:
+            warnings.warn(f'Failed to load the annotation cache {cache_file} '
+                          f'({e}), it will be rebuilt.')
+            return None
+        if cache.get('meta') != meta:
+            warnings.warn(f'Annotation cache {cache_file} was built from '
+                          'different annotations or settings and will be '
+                          'rebuilt.')
+            return None
+        return cache
+
+    def _dump_ann_cache(self, cache_file, meta):
+        """Dump the samples and the image index to the annotation cache.
+
+        A warning is raised instead if the cache file is not writable.
+        """
+        attrs = {
+            name: getattr(self, name)
+            for name in self._cached_attrs if hasattr(self, name)
+        }
+        # dump to a temporary file first, so that ranks building the same
+        # cache concurrently never read a partially written file
+        tmp_file = f'{cache_file}.{os.getpid()}.tmp'
+        try:
+            mmcv.mkdir_or_exist(osp.dirname(osp.abspath(cache_file)))
+            mmcv.dump(
+                dict(meta=meta, attrs=attrs, db=self.db),
+                tmp_file,
+                file_format='pkl')
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            warnings.warn(f'Failed to write the annotation cache {cache_file} '
+                          f'({e}), the annotations are not cached.')
+            if osp.exists(tmp_file):
+                os.remove(tmp_file)
+
     def _load_coco_keypoint_annotations(self):
         """Ground truth bbox and keypoints."""
         gt_db = []
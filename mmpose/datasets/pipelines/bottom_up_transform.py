@@ -380,7 +380,7 @@ class BottomUpRandomFlip:
         assert len(mask) == len(self.output_size)
 
         if np.random.random() < self.flip_prob:
-            image = image[:, ::-1].copy() - np.zeros_like(image)
+            image = np.ascontiguousarray(image[:, ::-1])
             for i, _output_size in enumerate(self.output_size):
                 if not isinstance(_output_size, np.ndarray):
                     _output_size = np.array(_output_size)
@@ -389,7 +389,7 @@ class BottomUpRandomFlip:
                 else:
                     _output_size = np.array([_output_size, _output_size],
                                             dtype=np.int)
-                mask[i] = mask[i][:, ::-1].copy()
+                mask[i] = np.ascontiguousarray(mask[i][:, ::-1])
                 joints[i] = joints[i][:, self.flip_index]
                 joints[i][:, :, 0] = _output_size[0] - joints[i][:, :, 0] - 1
         results['img'], results['mask'], results[
@@ -509,11 +509,11 @@ class BottomUpRandomAffine:
                         (_output_size[0], _output_size[1]), dtype=np.float32) -
                     1.0,
                     size_target=scale)
-                mask[i] = cv2.warpAffine(
+                # threshold the warped uint8 mask at 0.5 * 255 directly
+                mask[i] = (cv2.warpAffine(
                     (mask[i] * 255).astype(np.uint8),
                     trans, (int(_output_size[0]), int(_output_size[1])),
-                    flags=cv2.INTER_LINEAR) / 255
-                mask[i] = (mask[i] > 0.5).astype(np.float32)
+                    flags=cv2.INTER_LINEAR) > 127.5).astype(np.float32)
                 joints[i][:, :, 0:2] = \
                     warp_affine_joints(joints[i][:, :, 0:2].copy(), trans)
                 if results['ann_info']['scale_aware_sigma']:
@@ -543,10 +543,11 @@ class BottomUpRandomAffine:
                     scale=scale / 200.0,
                     rot=aug_rot,
                     output_size=_output_size)
-                mask[i] = cv2.warpAffine(
+                # threshold the warped uint8 mask at 0.5 * 255 directly
+                mask[i] = (cv2.warpAffine(
                     (mask[i] * 255).astype(np.uint8), mat_output,
-                    (int(_output_size[0]), int(_output_size[1]))) / 255
-                mask[i] = (mask[i] > 0.5).astype(np.float32)
+                    (int(_output_size[0]), int(_output_size[1]))) >
+                           127.5).astype(np.float32)
 
                 joints[i][:, :, 0:2] = \
                     warp_affine_joints(joints[i][:, :, 0:2], mat_output)
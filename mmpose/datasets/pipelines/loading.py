@@ -20,6 +20,10 @@ class LoadImageFromFile:
         color_type (str): Flags specifying the color type of a loaded image,
           candidates are 'color', 'grayscale' and 'unchanged'.
         channel_order (str): Order of channel, candidates are 'bgr' and 'rgb'.
+        imdecode_backend (str): The image decoding backend, candidates are
+            'cv2', 'turbojpeg', 'pillow' and 'tifffile'. 'turbojpeg' decodes
+            JPEG files faster but requires PyTurboJPEG to be installed.
+            See :func:`mmcv.imfrombytes` for details. Defaults to 'cv2'.
         file_client_args (dict): Arguments to instantiate a FileClient.
             See :class:`mmcv.fileio.FileClient` for details.
             Defaults to ``dict(backend='disk')``.
@@ -29,17 +33,22 @@ class LoadImageFromFile:
                  to_float32=False,
                  color_type='color',
                  channel_order='rgb',
+                 imdecode_backend='cv2',
                  file_client_args=dict(backend='disk')):
         self.to_float32 = to_float32
         self.color_type = color_type
         self.channel_order = channel_order
+        self.imdecode_backend = imdecode_backend
         self.file_client_args = file_client_args.copy()
         self.file_client = None
 
     def _read_image(self, path):
         img_bytes = self.file_client.get(path)
         img = mmcv.imfrombytes(
-            img_bytes, flag=self.color_type, channel_order=self.channel_order)
+            img_bytes,
+            flag=self.color_type,
+            channel_order=self.channel_order,
+            backend=self.imdecode_backend)
         if img is None:
             raise ValueError(f'Fail to read {path}')
         if self.to_float32:
@@ -97,6 +106,7 @@ class LoadImageFromFile:
         repr_str = (f'{self.__class__.__name__}('
                     f'to_float32={self.to_float32}, '
                     f"color_type='{self.color_type}', "
+                    f"imdecode_backend='{self.imdecode_backend}', "
                     f'file_client_args={self.file_client_args})')
         return repr_str
 
@@ -2,6 +2,7 @@
 import warnings
 from collections.abc import Sequence
 
+import cv2
 import mmcv
 import numpy as np
 import torch
@@ -72,6 +73,49 @@ class NormalizeTensor:
         return results
 
 
+@PIPELINES.register_module()
+class NormalizeLUT:
+    """Transform the image to a normalized Tensor (CxHxW) with a lookup table.
+
+    This is equivalent to ``ToTensor`` followed by ``NormalizeTensor`` with
+    the same ``mean`` and ``std``. For uint8 images, the per-pixel float
+    arithmetic is replaced by a single 256-entry lookup (``cv2.LUT``) that
+    directly yields the normalized float32 values.
+
+    Required key: 'img'. Modifies key: 'img'.
+
+    Args:
+        mean (list[float]): Mean values of 3 channels.
+        std (list[float]): Std values of 3 channels.
+    """
+
+    def __init__(self, mean, std):
+        self.mean = mean
+        self.std = std
+        self._mean = np.array(mean, dtype=np.float32)
+        self._std = np.array(std, dtype=np.float32)
+        # lut[0, i, c] is the normalized value of intensity i in channel c
+        lut = (np.arange(256, dtype=np.float32)[:, None] / 255.0 -
+               self._mean) / self._std
+        self.lut = lut[None].astype(np.float32)
+
+    def _normalize(self, img):
+        if img.dtype == np.uint8 and img.ndim == 3 and img.shape[2] == len(
+                self.mean):
+            img = cv2.LUT(img, self.lut)
+        else:
+            img = (img.astype(np.float32) / 255.0 - self._mean) / self._std
+        return torch.from_numpy(img).permute(2, 0, 1)
+
+    def __call__(self, results):
+        if isinstance(results['img'], (list, tuple)):
+            results['img'] = [self._normalize(img) for img in results['img']]
+        else:
+            results['img'] = self._normalize(results['img'])
+
+        return results
+
+
 @PIPELINES.register_module()
 class Compose:
     """Compose a data pipeline with a sequence of transforms.
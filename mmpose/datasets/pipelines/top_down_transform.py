@@ -5,9 +5,8 @@ import cv2
 import numpy as np
 
 from mmpose.core.bbox import bbox_xywh2cs
-from mmpose.core.post_processing import (affine_transform, fliplr_joints,
-                                         get_affine_transform, get_warp_matrix,
-                                         warp_affine_joints)
+from mmpose.core.post_processing import (fliplr_joints, get_affine_transform,
+                                         get_warp_matrix, warp_affine_joints)
 from mmpose.datasets.builder import PIPELINES
 
 
@@ -97,15 +96,21 @@ class TopDownRandomFlip:
     'ann_info'.
 
     Modifies key: 'img', 'joints_3d', 'joints_3d_visible', 'center' and
-    'flipped'.
+    'flipped'. With ``defer_img_flip``, 'img' is kept and
+    'img_flip_deferred' is added instead.
 
     Args:
         flip (bool): Option to perform random flip.
         flip_prob (float): Probability of flip.
+        defer_img_flip (bool): Whether to leave the image unflipped and let
+            the following :class:`TopDownAffine` flip it within its warp,
+            which saves a copy of the full image. Only the joints and the
+            center are flipped here. Default: False.
     """
 
-    def __init__(self, flip_prob=0.5):
+    def __init__(self, flip_prob=0.5, defer_img_flip=False):
         self.flip_prob = flip_prob
+        self.defer_img_flip = defer_img_flip
 
     def __call__(self, results):
         """Perform data augmentation with random image flip."""
@@ -119,7 +124,10 @@ class TopDownRandomFlip:
         flipped = False
         if np.random.rand() <= self.flip_prob:
             flipped = True
-            if not isinstance(img, list):
+            if self.defer_img_flip:
+                # the image is flipped later by TopDownAffine
+                pass
+            elif not isinstance(img, list):
                 img = img[:, ::-1, :]
             else:
                 img = [i[:, ::-1, :] for i in img]
@@ -139,6 +147,8 @@ class TopDownRandomFlip:
         results['joints_3d_visible'] = joints_3d_visible
         results['center'] = center
         results['flipped'] = flipped
+        if self.defer_img_flip:
+            results['img_flip_deferred'] = flipped
 
         return results
 
@@ -271,6 +281,10 @@ class TopDownAffine:
 
     Modified key:'img', 'joints_3d', and 'joints_3d_visible'.
 
+    If 'img_flip_deferred' is set by :class:`TopDownRandomFlip`, the
+    horizontal flip of the image is composed into the warp matrix, so the
+    image is flipped and cropped by a single ``cv2.warpAffine``.
+
     Args:
         use_udp (bool): To use unbiased data processing.
             Paper ref: Huang et al. The Devil is in the Details: Delving into
@@ -292,40 +306,40 @@ class TopDownAffine:
 
         if self.use_udp:
             trans = get_warp_matrix(r, c * 2.0, image_size - 1.0, s * 200.0)
-            if not isinstance(img, list):
-                img = cv2.warpAffine(
-                    img,
-                    trans, (int(image_size[0]), int(image_size[1])),
-                    flags=cv2.INTER_LINEAR)
-            else:
-                img = [
-                    cv2.warpAffine(
-                        i,
-                        trans, (int(image_size[0]), int(image_size[1])),
-                        flags=cv2.INTER_LINEAR) for i in img
-                ]
+        else:
+            trans = get_affine_transform(c, s, r, image_size)
 
+        img_trans = trans
+        if results.pop('img_flip_deferred', False):
+            # the joints and center are given in the flipped image, so map
+            # the original image to the flipped one before the crop
+            img_w = img[0].shape[1] if isinstance(img, list) else img.shape[1]
+            flip_mat = np.array([[-1., 0., img_w - 1.], [0., 1., 0.],
+                                 [0., 0., 1.]])
+            img_trans = trans @ flip_mat
+
+        if not isinstance(img, list):
+            img = cv2.warpAffine(
+                img,
+                img_trans, (int(image_size[0]), int(image_size[1])),
+                flags=cv2.INTER_LINEAR)
+        else:
+            img = [
+                cv2.warpAffine(
+                    i,
+                    img_trans, (int(image_size[0]), int(image_size[1])),
+                    flags=cv2.INTER_LINEAR) for i in img
+            ]
+
+        # transform all the joints with a single matrix product
+        if self.use_udp:
             joints_3d[:, 0:2] = \
                 warp_affine_joints(joints_3d[:, 0:2].copy(), trans)
-
         else:
-            trans = get_affine_transform(c, s, r, image_size)
-            if not isinstance(img, list):
-                img = cv2.warpAffine(
-                    img,
-                    trans, (int(image_size[0]), int(image_size[1])),
-                    flags=cv2.INTER_LINEAR)
-            else:
-                img = [
-                    cv2.warpAffine(
-                        i,
-                        trans, (int(image_size[0]), int(image_size[1])),
-                        flags=cv2.INTER_LINEAR) for i in img
-                ]
-            for i in range(results['ann_info']['num_joints']):
-                if joints_3d_visible[i, 0] > 0.0:
-                    joints_3d[i,
-                              0:2] = affine_transform(joints_3d[i, 0:2], trans)
+            joints = joints_3d[:results['ann_info']['num_joints']]
+            visible = joints_3d_visible[:len(joints), 0] > 0.0
+            joints[visible, 0:2] = warp_affine_joints(joints[visible, 0:2],
+                                                      trans)
 
         results['img'] = img
         results['joints_3d'] = joints_3d
@@ -403,35 +417,36 @@ class TopDownGenerateTarget:
         # 3-sigma rule
         tmp_size = sigma * 3
 
-        if self.unbiased_encoding:
-            for joint_id in range(num_joints):
-                target_weight[joint_id] = joints_3d_visible[joint_id, 0]
-
-                feat_stride = image_size / [W, H]
-                mu_x = joints_3d[joint_id][0] / feat_stride[0]
-                mu_y = joints_3d[joint_id][1] / feat_stride[1]
-                # Check that any part of the gaussian is in-bounds
-                ul = [mu_x - tmp_size, mu_y - tmp_size]
-                br = [mu_x + tmp_size + 1, mu_y + tmp_size + 1]
-                if ul[0] >= W or ul[1] >= H or br[0] < 0 or br[1] < 0:
-                    target_weight[joint_id] = 0
-
-                if target_weight[joint_id] == 0:
-                    continue
+        feat_stride = image_size / [W, H]
+        target_weight[:, 0] = joints_3d_visible[:num_joints, 0]
 
-                x = np.arange(0, W, 1, np.float32)
-                y = np.arange(0, H, 1, np.float32)
-                y = y[:, None]
-
-                if target_weight[joint_id] > 0.5:
-                    target[joint_id] = np.exp(-((x - mu_x)**2 +
-                                                (y - mu_y)**2) /
-                                              (2 * sigma**2))
+        if self.unbiased_encoding:
+            # generate the gaussians of all the joints at once
+            mu_x, mu_y = (joints_3d[:num_joints, 0:2] / feat_stride).T
+            # Check that any part of the gaussian is in-bounds
+            out_of_bounds = (mu_x - tmp_size >= W) | (mu_y - tmp_size >= H) \
+                | (mu_x + tmp_size + 1 < 0) | (mu_y + tmp_size + 1 < 0)
+            target_weight[out_of_bounds] = 0
+
+            valid = target_weight[:, 0] > 0.5
+            x = np.arange(0, W, 1, np.float32)
+            y = np.arange(0, H, 1, np.float32)
+            y = y[:, None]
+            mu_x = mu_x[valid, None, None]
+            mu_y = mu_y[valid, None, None]
+            target[valid] = np.exp(-((x - mu_x)**2 + (y - mu_y)**2) /
+                                   (2 * sigma**2))
         else:
-            for joint_id in range(num_joints):
-                target_weight[joint_id] = joints_3d_visible[joint_id, 0]
+            # the gaussian patch is shared by all the joints
+            size = 2 * tmp_size + 1
+            x = np.arange(0, size, 1, np.float32)
+            y = x[:, None]
+            x0 = y0 = size // 2
+            # The gaussian is not normalized,
+            # we want the center value to equal 1
+            g = np.exp(-((x - x0)**2 + (y - y0)**2) / (2 * sigma**2))
 
-                feat_stride = image_size / [W, H]
+            for joint_id in range(num_joints):
                 mu_x = int(joints_3d[joint_id][0] / feat_stride[0] + 0.5)
                 mu_y = int(joints_3d[joint_id][1] / feat_stride[1] + 0.5)
                 # Check that any part of the gaussian is in-bounds
@@ -441,14 +456,6 @@ class TopDownGenerateTarget:
                     target_weight[joint_id] = 0
 
                 if target_weight[joint_id] > 0.5:
-                    size = 2 * tmp_size + 1
-                    x = np.arange(0, size, 1, np.float32)
-                    y = x[:, None]
-                    x0 = y0 = size // 2
-                    # The gaussian is not normalized,
-                    # we want the center value to equal 1
-                    g = np.exp(-((x - x0)**2 + (y - y0)**2) / (2 * sigma**2))
-
                     # Usable gaussian range
                     g_x = max(0, -ul[0]), min(br[0], W) - ul[0]
                     g_y = max(0, -ul[1]), min(br[1], H) - ul[1]
@@ -484,28 +491,28 @@ class TopDownGenerateTarget:
         num_joints = cfg['num_joints']
         image_size = cfg['image_size']
         W, H = cfg['heatmap_size']
-        heatmaps = np.zeros((num_joints, H, W), dtype='float32')
-        target_weight = np.zeros((num_joints, 1), dtype=np.float32)
-
-        for i in range(num_joints):
-            target_weight[i] = joints_3d_visible[i, 0]
-
-            if target_weight[i] < 1:
-                continue
-
-            target_y = int(joints_3d[i, 1] * H / image_size[1])
-            target_x = int(joints_3d[i, 0] * W / image_size[0])
-
-            if (target_x >= W or target_x < 0) \
-                    or (target_y >= H or target_y < 0):
-                target_weight[i] = 0
-                continue
-
-            heatmaps[i, target_y, target_x] = 1
-            heatmaps[i] = cv2.GaussianBlur(heatmaps[i], kernel, 0)
-            maxi = heatmaps[i, target_y, target_x]
-
-            heatmaps[i] /= maxi / 255
+        target_weight = joints_3d_visible[:num_joints, 0:1].astype(np.float32)
+
+        target_x = (joints_3d[:num_joints, 0] * W /
+                    image_size[0]).astype(np.int64)
+        target_y = (joints_3d[:num_joints, 1] * H /
+                    image_size[1]).astype(np.int64)
+        visible = target_weight[:, 0] >= 1
+        inside = (target_x >= 0) & (target_x < W) & (target_y >= 0) & (
+            target_y < H)
+        target_weight[visible & ~inside] = 0
+        keep = np.flatnonzero(visible & inside)
+        target_x, target_y = target_x[keep], target_y[keep]
+
+        # blur all joints in a single call with joints as channels
+        heatmaps = np.zeros((H, W, num_joints), dtype=np.float32)
+        heatmaps[target_y, target_x, keep] = 1
+        heatmaps = cv2.GaussianBlur(heatmaps, kernel, 0)
+        heatmaps = np.ascontiguousarray(
+            heatmaps.reshape(H, W, num_joints).transpose(2, 0, 1))
+
+        maxi = heatmaps[keep, target_y, target_x]
+        heatmaps[keep] /= (maxi / 255)[:, None, None]
 
         return heatmaps, target_weight
 
@@ -549,54 +556,40 @@ class TopDownGenerateTarget:
         target_weight = np.ones((num_joints, 1), dtype=np.float32)
         target_weight[:, 0] = joints_3d_visible[:, 0]
 
-        if target_type.lower() == 'GaussianHeatmap'.lower():
-            target = np.zeros((num_joints, heatmap_size[1], heatmap_size[0]),
-                              dtype=np.float32)
+        feat_stride = (image_size - 1.0) / (heatmap_size - 1.0)
+        mu_x_ac, mu_y_ac = (joints_3d[:num_joints, 0:2] / feat_stride).T
 
+        if target_type.lower() == 'GaussianHeatmap'.lower():
+            W, H = heatmap_size
             tmp_size = factor * 3
-
-            # prepare for gaussian
             size = 2 * tmp_size + 1
-            x = np.arange(0, size, 1, np.float32)
-            y = x[:, None]
 
-            for joint_id in range(num_joints):
-                feat_stride = (image_size - 1.0) / (heatmap_size - 1.0)
-                mu_x = int(joints_3d[joint_id][0] / feat_stride[0] + 0.5)
-                mu_y = int(joints_3d[joint_id][1] / feat_stride[1] + 0.5)
-                # Check that any part of the gaussian is in-bounds
-                ul = [int(mu_x - tmp_size), int(mu_y - tmp_size)]
-                br = [int(mu_x + tmp_size + 1), int(mu_y + tmp_size + 1)]
-                if ul[0] >= heatmap_size[0] or ul[1] >= heatmap_size[1] \
-                        or br[0] < 0 or br[1] < 0:
-                    # If not, just return the image as is
-                    target_weight[joint_id] = 0
-                    continue
-
-                # # Generate gaussian
-                mu_x_ac = joints_3d[joint_id][0] / feat_stride[0]
-                mu_y_ac = joints_3d[joint_id][1] / feat_stride[1]
-                x0 = y0 = size // 2
-                x0 += mu_x_ac - mu_x
-                y0 += mu_y_ac - mu_y
-                g = np.exp(-((x - x0)**2 + (y - y0)**2) / (2 * factor**2))
-
-                # Usable gaussian range
-                g_x = max(0, -ul[0]), min(br[0], heatmap_size[0]) - ul[0]
-                g_y = max(0, -ul[1]), min(br[1], heatmap_size[1]) - ul[1]
-                # Image range
-                img_x = max(0, ul[0]), min(br[0], heatmap_size[0])
-                img_y = max(0, ul[1]), min(br[1], heatmap_size[1])
-
-                v = target_weight[joint_id]
-                if v > 0.5:
-                    target[joint_id][img_y[0]:img_y[1], img_x[0]:img_x[1]] = \
-                        g[g_y[0]:g_y[1], g_x[0]:g_x[1]]
+            mu_x = (mu_x_ac + 0.5).astype(np.int64)
+            mu_y = (mu_y_ac + 0.5).astype(np.int64)
+            # Check that any part of the gaussian is in-bounds
+            ul_x = (mu_x - tmp_size).astype(np.int64)
+            ul_y = (mu_y - tmp_size).astype(np.int64)
+            br_x = (mu_x + tmp_size + 1).astype(np.int64)
+            br_y = (mu_y + tmp_size + 1).astype(np.int64)
+            out_of_bounds = (ul_x >= W) | (ul_y >= H) | (br_x < 0) | (br_y < 0)
+            target_weight[out_of_bounds] = 0
+
+            # The gaussian is separable, so it is generated for all the
+            # joints as the outer product of its 1-D profiles, which are
+            # cropped to the window [ul, br) around each joint.
+            x = np.arange(0, W, 1, np.float32)
+            y = np.arange(0, H, 1, np.float32)
+            dx = x - ul_x[:, None] - size // 2 - (mu_x_ac - mu_x)[:, None]
+            dy = y - ul_y[:, None] - size // 2 - (mu_y_ac - mu_y)[:, None]
+            g_x = np.exp(-dx**2 / (2 * factor**2))
+            g_y = np.exp(-dy**2 / (2 * factor**2))
+            g_x[(x < ul_x[:, None]) | (x >= br_x[:, None])] = 0
+            g_y[(y < ul_y[:, None]) | (y >= br_y[:, None])] = 0
+            g_x[target_weight[:, 0] <= 0.5] = 0
+
+            target = (g_y[:, :, None] * g_x[:, None, :]).astype(np.float32)
 
         elif target_type.lower() == 'CombinedTarget'.lower():
-            target = np.zeros(
-                (num_joints, 3, heatmap_size[1] * heatmap_size[0]),
-                dtype=np.float32)
             feat_width = heatmap_size[0]
             feat_height = heatmap_size[1]
             feat_x_int = np.arange(0, feat_width)
@@ -607,19 +600,14 @@ class TopDownGenerateTarget:
             # Calculate the radius of the positive area in classification
             #   heatmap.
             valid_radius = factor * heatmap_size[1]
-            feat_stride = (image_size - 1.0) / (heatmap_size - 1.0)
-            for joint_id in range(num_joints):
-                mu_x = joints_3d[joint_id][0] / feat_stride[0]
-                mu_y = joints_3d[joint_id][1] / feat_stride[1]
-                x_offset = (mu_x - feat_x_int) / valid_radius
-                y_offset = (mu_y - feat_y_int) / valid_radius
-                dis = x_offset**2 + y_offset**2
-                keep_pos = np.where(dis <= 1)[0]
-                v = target_weight[joint_id]
-                if v > 0.5:
-                    target[joint_id, 0, keep_pos] = 1
-                    target[joint_id, 1, keep_pos] = x_offset[keep_pos]
-                    target[joint_id, 2, keep_pos] = y_offset[keep_pos]
+            x_offset = (mu_x_ac[:, None] - feat_x_int) / valid_radius
+            y_offset = (mu_y_ac[:, None] - feat_y_int) / valid_radius
+            dis = x_offset**2 + y_offset**2
+            keep_pos = (dis <= 1) & (target_weight > 0.5)
+            x_offset[~keep_pos] = 0
+            y_offset[~keep_pos] = 0
+            target = np.stack([keep_pos, x_offset, y_offset],
+                              axis=1).astype(np.float32)
             target = target.reshape(num_joints * 3, heatmap_size[1],
                                     heatmap_size[0])
         else:
@@ -640,21 +628,14 @@ class TopDownGenerateTarget:
 
         if self.encoding == 'MSRA':
             if isinstance(self.sigma, list):
-                num_sigmas = len(self.sigma)
                 cfg = results['ann_info']
-                num_joints = cfg['num_joints']
-                heatmap_size = cfg['heatmap_size']
-
-                target = np.empty(
-                    (0, num_joints, heatmap_size[1], heatmap_size[0]),
-                    dtype=np.float32)
-                target_weight = np.empty((0, num_joints, 1), dtype=np.float32)
-                for i in range(num_sigmas):
-                    target_i, target_weight_i = self._msra_generate_target(
-                        cfg, joints_3d, joints_3d_visible, self.sigma[i])
-                    target = np.concatenate([target, target_i[None]], axis=0)
-                    target_weight = np.concatenate(
-                        [target_weight, target_weight_i[None]], axis=0)
+                target, target_weight = zip(*[
+                    self._msra_generate_target(cfg, joints_3d,
+                                               joints_3d_visible, sigma)
+                    for sigma in self.sigma
+                ])
+                target = np.stack(target)
+                target_weight = np.stack(target_weight)
             else:
                 target, target_weight = self._msra_generate_target(
                     results['ann_info'], joints_3d, joints_3d_visible,
@@ -662,19 +643,14 @@ class TopDownGenerateTarget:
 
         elif self.encoding == 'Megvii':
             if isinstance(self.kernel, list):
-                num_kernels = len(self.kernel)
                 cfg = results['ann_info']
-                num_joints = cfg['num_joints']
-                W, H = cfg['heatmap_size']
-
-                target = np.empty((0, num_joints, H, W), dtype=np.float32)
-                target_weight = np.empty((0, num_joints, 1), dtype=np.float32)
-                for i in range(num_kernels):
-                    target_i, target_weight_i = self._megvii_generate_target(
-                        cfg, joints_3d, joints_3d_visible, self.kernel[i])
-                    target = np.concatenate([target, target_i[None]], axis=0)
-                    target_weight = np.concatenate(
-                        [target_weight, target_weight_i[None]], axis=0)
+                target, target_weight = zip(*[
+                    self._megvii_generate_target(cfg, joints_3d,
+                                                 joints_3d_visible, kernel)
+                    for kernel in self.kernel
+                ])
+                target = np.stack(target)
+                target_weight = np.stack(target_weight)
             else:
                 target, target_weight = self._megvii_generate_target(
                     results['ann_info'], joints_3d, joints_3d_visible,
@@ -683,29 +659,20 @@ class TopDownGenerateTarget:
         elif self.encoding == 'UDP':
             if self.target_type.lower() == 'CombinedTarget'.lower():
                 factors = self.valid_radius_factor
-                channel_factor = 3
             elif self.target_type.lower() == 'GaussianHeatmap'.lower():
                 factors = self.sigma
-                channel_factor = 1
             else:
                 raise ValueError('target_type should be either '
                                  "'GaussianHeatmap' or 'CombinedTarget'")
             if isinstance(factors, list):
-                num_factors = len(factors)
                 cfg = results['ann_info']
-                num_joints = cfg['num_joints']
-                W, H = cfg['heatmap_size']
-
-                target = np.empty((0, channel_factor * num_joints, H, W),
-                                  dtype=np.float32)
-                target_weight = np.empty((0, num_joints, 1), dtype=np.float32)
-                for i in range(num_factors):
-                    target_i, target_weight_i = self._udp_generate_target(
-                        cfg, joints_3d, joints_3d_visible, factors[i],
-                        self.target_type)
-                    target = np.concatenate([target, target_i[None]], axis=0)
-                    target_weight = np.concatenate(
-                        [target_weight, target_weight_i[None]], axis=0)
+                target, target_weight = zip(*[
+                    self._udp_generate_target(
+                        cfg, joints_3d, joints_3d_visible, factor,
+                        self.target_type) for factor in factors
+                ])
+                target = np.stack(target)
+                target_weight = np.stack(target_weight)
             else:
                 target, target_weight = self._udp_generate_target(
                     results['ann_info'], joints_3d, joints_3d_visible, factors,
@@ -36,6 +36,9 @@ class AssociativeEmbedding(BasePose):
         pretrained (str): Path to the pretrained models.
         loss_pose (None): Deprecated arguments. Please use
             ``loss_keypoint`` for heads instead.
+        channels_last (bool): Whether to convert the model to the
+            channels-last memory format, which lets cuDNN pick faster
+            convolution kernels on tensor cores. Default: False.
     """
 
     def __init__(self,
@@ -44,7 +47,8 @@ class AssociativeEmbedding(BasePose):
                  train_cfg=None,
                  test_cfg=None,
                  pretrained=None,
-                 loss_pose=None):
+                 loss_pose=None,
+                 channels_last=False):
         super().__init__()
         self.fp16_enabled = False
 
@@ -68,6 +72,9 @@ class AssociativeEmbedding(BasePose):
         self.pretrained = pretrained
         self.init_weights()
 
+        if channels_last:
+            self.to(memory_format=torch.channels_last)
+
     @property
     def with_keypoint(self):
         """Check if has keypoint_head."""
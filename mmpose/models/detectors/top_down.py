@@ -3,6 +3,7 @@ import warnings
 
 import mmcv
 import numpy as np
+import torch
 from mmcv.image import imwrite
 from mmcv.utils.misc import deprecated_api_warning
 from mmcv.visualization.image import imshow
@@ -32,6 +33,9 @@ class TopDown(BasePose):
         pretrained (str): Path to the pretrained models.
         loss_pose (None): Deprecated arguments. Please use
             `loss_keypoint` for heads instead.
+        channels_last (bool): Whether to convert the model to the
+            channels-last memory format, which lets cuDNN pick faster
+            convolution kernels on tensor cores. Default: False.
     """
 
     def __init__(self,
@@ -41,7 +45,8 @@ class TopDown(BasePose):
                  train_cfg=None,
                  test_cfg=None,
                  pretrained=None,
-                 loss_pose=None):
+                 loss_pose=None,
+                 channels_last=False):
         super().__init__()
         self.fp16_enabled = False
 
@@ -69,6 +74,9 @@ class TopDown(BasePose):
         self.pretrained = pretrained
         self.init_weights()
 
+        if channels_last:
+            self.to(memory_format=torch.channels_last)
+
     @property
     def with_neck(self):
         """Check if has neck."""
@@ -11,6 +11,7 @@ from mmpose.core.evaluation import pose_pck_accuracy
 from mmpose.core.post_processing import flip_back
 from mmpose.models.builder import build_loss
 from ..builder import HEADS
+from ..losses import JointsMultiStageMSELoss
 from .topdown_heatmap_base_head import TopdownHeatmapBaseHead
 
 
@@ -402,7 +403,9 @@ class TopdownHeatmapMSMUHead(TopdownHeatmapBaseHead):
             Default: False.
         norm_cfg (dict): dictionary to construct and config norm layer.
             Default: dict(type='BN')
-        loss_keypoint (dict): Config for keypoint loss. Default: None.
+        loss_keypoint (dict | list[dict]): Config for keypoint loss. A
+            list builds one loss per stage, while ``JointsMultiStageMSELoss``
+            computes the loss of all stages at once. Default: None.
     """
 
     def __init__(self,
@@ -466,6 +469,10 @@ class TopdownHeatmapMSMUHead(TopdownHeatmapBaseHead):
         assert target.dim() == 5 and target_weight.dim() == 4
         assert target.size(1) == len(output)
 
+        if isinstance(self.loss, JointsMultiStageMSELoss):
+            losses['heatmap_loss'] = self.loss(output, target, target_weight)
+            return losses
+
         if isinstance(self.loss, nn.Sequential):
             assert len(self.loss) == len(output)
         for i in range(len(output)):
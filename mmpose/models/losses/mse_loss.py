@@ -1,7 +1,9 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 
+from mmpose.utils import compile_forward
 from ..builder import LOSSES
 
 
@@ -13,35 +15,34 @@ class JointsMSELoss(nn.Module):
         use_target_weight (bool): Option to use weighted MSE loss.
             Different joint types may have different target weights.
         loss_weight (float): Weight of the loss. Default: 1.0.
+        compile (bool | dict): Whether to compile ``forward`` with
+            ``torch.compile`` (PyTorch >= 2.0), or the keyword arguments of
+            ``torch.compile``. Default: False.
     """
 
-    def __init__(self, use_target_weight=False, loss_weight=1.):
+    def __init__(self, use_target_weight=False, loss_weight=1., compile=False):
         super().__init__()
-        self.criterion = nn.MSELoss()
+        self.criterion = F.mse_loss
         self.use_target_weight = use_target_weight
         self.loss_weight = loss_weight
+        compile_forward(self, compile)
 
     def forward(self, output, target, target_weight):
         """Forward function."""
         batch_size = output.size(0)
         num_joints = output.size(1)
 
-        heatmaps_pred = output.reshape(
-            (batch_size, num_joints, -1)).split(1, 1)
-        heatmaps_gt = target.reshape((batch_size, num_joints, -1)).split(1, 1)
+        heatmaps_pred = output.reshape((batch_size, num_joints, -1))
+        heatmaps_gt = target.reshape((batch_size, num_joints, -1))
 
-        loss = 0.
-
-        for idx in range(num_joints):
-            heatmap_pred = heatmaps_pred[idx].squeeze(1)
-            heatmap_gt = heatmaps_gt[idx].squeeze(1)
-            if self.use_target_weight:
-                loss += self.criterion(heatmap_pred * target_weight[:, idx],
-                                       heatmap_gt * target_weight[:, idx])
-            else:
-                loss += self.criterion(heatmap_pred, heatmap_gt)
+        if self.use_target_weight:
+            # weight the difference once instead of both heatmaps
+            diff = (heatmaps_pred - heatmaps_gt) * target_weight
+            loss = diff.pow(2).mean()
+        else:
+            loss = self.criterion(heatmaps_pred, heatmaps_gt)
 
-        return loss / num_joints * self.loss_weight
+        return loss * self.loss_weight
 
 
 @LOSSES.register_module()
@@ -56,41 +57,39 @@ class CombinedTargetMSELoss(nn.Module):
         use_target_weight (bool): Option to use weighted MSE loss.
             Different joint types may have different target weights.
         loss_weight (float): Weight of the loss. Default: 1.0.
+        compile (bool | dict): Whether to compile ``forward`` with
+            ``torch.compile`` (PyTorch >= 2.0), or the keyword arguments of
+            ``torch.compile``. Default: False.
     """
 
-    def __init__(self, use_target_weight, loss_weight=1.):
+    def __init__(self, use_target_weight, loss_weight=1., compile=False):
         super().__init__()
-        self.criterion = nn.MSELoss(reduction='mean')
+        self.criterion = F.mse_loss
         self.use_target_weight = use_target_weight
         self.loss_weight = loss_weight
+        compile_forward(self, compile)
 
     def forward(self, output, target, target_weight):
         batch_size = output.size(0)
         num_channels = output.size(1)
-        heatmaps_pred = output.reshape(
-            (batch_size, num_channels, -1)).split(1, 1)
-        heatmaps_gt = target.reshape(
-            (batch_size, num_channels, -1)).split(1, 1)
-        loss = 0.
         num_joints = num_channels // 3
-        for idx in range(num_joints):
-            heatmap_pred = heatmaps_pred[idx * 3].squeeze()
-            heatmap_gt = heatmaps_gt[idx * 3].squeeze()
-            offset_x_pred = heatmaps_pred[idx * 3 + 1].squeeze()
-            offset_x_gt = heatmaps_gt[idx * 3 + 1].squeeze()
-            offset_y_pred = heatmaps_pred[idx * 3 + 2].squeeze()
-            offset_y_gt = heatmaps_gt[idx * 3 + 2].squeeze()
-            if self.use_target_weight:
-                heatmap_pred = heatmap_pred * target_weight[:, idx]
-                heatmap_gt = heatmap_gt * target_weight[:, idx]
-            # classification loss
-            loss += 0.5 * self.criterion(heatmap_pred, heatmap_gt)
-            # regression loss
-            loss += 0.5 * self.criterion(heatmap_gt * offset_x_pred,
-                                         heatmap_gt * offset_x_gt)
-            loss += 0.5 * self.criterion(heatmap_gt * offset_y_pred,
-                                         heatmap_gt * offset_y_gt)
-        return loss / num_joints * self.loss_weight
+        heatmaps_pred = output.reshape((batch_size, num_joints, 3, -1))
+        heatmaps_gt = target.reshape((batch_size, num_joints, 3, -1))
+        heatmap_pred = heatmaps_pred[:, :, 0]
+        heatmap_gt = heatmaps_gt[:, :, 0]
+        offsets_pred = heatmaps_pred[:, :, 1:]
+        offsets_gt = heatmaps_gt[:, :, 1:]
+        if self.use_target_weight:
+            heatmap_pred = heatmap_pred * target_weight
+            heatmap_gt = heatmap_gt * target_weight
+        # classification loss
+        loss = 0.5 * self.criterion(heatmap_pred, heatmap_gt)
+        # regression loss of the x and y offsets, i.e. the sum of
+        # 0.5 * mse(heatmap_gt * offset_pred, heatmap_gt * offset_gt)
+        # over both offsets, with the difference taken before the product
+        diff = heatmap_gt.unsqueeze(2) * (offsets_pred - offsets_gt)
+        loss += diff.pow(2).mean()
+        return loss * self.loss_weight
 
 
 @LOSSES.register_module()
@@ -102,28 +101,29 @@ class JointsOHKMMSELoss(nn.Module):
             Different joint types may have different target weights.
         topk (int): Only top k joint losses are kept.
         loss_weight (float): Weight of the loss. Default: 1.0.
+        compile (bool | dict): Whether to compile ``forward`` with
+            ``torch.compile`` (PyTorch >= 2.0), or the keyword arguments of
+            ``torch.compile``. Default: False.
     """
 
-    def __init__(self, use_target_weight=False, topk=8, loss_weight=1.):
+    def __init__(self,
+                 use_target_weight=False,
+                 topk=8,
+                 loss_weight=1.,
+                 compile=False):
         super().__init__()
         assert topk > 0
-        self.criterion = nn.MSELoss(reduction='none')
+        self.criterion = F.mse_loss
         self.use_target_weight = use_target_weight
         self.topk = topk
         self.loss_weight = loss_weight
+        compile_forward(self, compile)
 
     def _ohkm(self, loss):
         """Online hard keypoint mining."""
-        ohkm_loss = 0.
-        N = len(loss)
-        for i in range(N):
-            sub_loss = loss[i]
-            _, topk_idx = torch.topk(
-                sub_loss, k=self.topk, dim=0, sorted=False)
-            tmp_loss = torch.gather(sub_loss, 0, topk_idx)
-            ohkm_loss += torch.sum(tmp_loss) / self.topk
-        ohkm_loss /= N
-        return ohkm_loss
+        # average the top k joint losses of each sample over the batch
+        topk_loss, _ = torch.topk(loss, k=self.topk, dim=1, sorted=False)
+        return topk_loss.mean()
 
     def forward(self, output, target, target_weight):
         """Forward function."""
@@ -132,22 +132,111 @@ class JointsOHKMMSELoss(nn.Module):
         if num_joints < self.topk:
             raise ValueError(f'topk ({self.topk}) should not '
                              f'larger than num_joints ({num_joints}).')
-        heatmaps_pred = output.reshape(
-            (batch_size, num_joints, -1)).split(1, 1)
-        heatmaps_gt = target.reshape((batch_size, num_joints, -1)).split(1, 1)
-
-        losses = []
-        for idx in range(num_joints):
-            heatmap_pred = heatmaps_pred[idx].squeeze(1)
-            heatmap_gt = heatmaps_gt[idx].squeeze(1)
-            if self.use_target_weight:
-                losses.append(
-                    self.criterion(heatmap_pred * target_weight[:, idx],
-                                   heatmap_gt * target_weight[:, idx]))
-            else:
-                losses.append(self.criterion(heatmap_pred, heatmap_gt))
-
-        losses = [loss.mean(dim=1).unsqueeze(dim=1) for loss in losses]
-        losses = torch.cat(losses, dim=1)
+        heatmaps_pred = output.reshape((batch_size, num_joints, -1))
+        heatmaps_gt = target.reshape((batch_size, num_joints, -1))
+
+        # [N, K]
+        losses = self.criterion(
+            heatmaps_pred, heatmaps_gt, reduction='none').mean(dim=2)
+        if self.use_target_weight:
+            # weight the per-joint losses instead of the full heatmaps
+            losses = losses * target_weight.reshape(batch_size,
+                                                    num_joints).pow(2)
 
         return self._ohkm(losses) * self.loss_weight
+
+
+@LOSSES.register_module()
+class JointsMultiStageMSELoss(nn.Module):
+    """Fused MSE / OHKM-MSE loss over all stages of a multi-stage head.
+
+    It is equivalent to summing one ``JointsMSELoss`` or
+    ``JointsOHKMMSELoss`` per stage, but computes the squared errors of all
+    stages at once and mines the hard keypoints of all OHKM stages with a
+    single ``topk`` call.
+
+    Args:
+        stage_weights (list[float]): Loss weight of each stage.
+        use_target_weight (bool): Option to use weighted MSE loss.
+            Different joint types may have different target weights.
+        ohkm_stages (list[int]): Indices of the stages that use online hard
+            keypoint mining. Default: ().
+        topk (int): Only top k joint losses are kept in OHKM stages.
+            Default: 8.
+        loss_weight (float): Weight of the loss. Default: 1.0.
+        compile (bool | dict): Whether to compile ``forward`` with
+            ``torch.compile`` (PyTorch >= 2.0), or the keyword arguments of
+            ``torch.compile``. Default: False.
+    """
+
+    def __init__(self,
+                 stage_weights,
+                 use_target_weight=False,
+                 ohkm_stages=(),
+                 topk=8,
+                 loss_weight=1.,
+                 compile=False):
+        super().__init__()
+        assert topk > 0
+        num_stages = len(stage_weights)
+        ohkm_stages = sorted(set(ohkm_stages))
+        assert all(0 <= i < num_stages for i in ohkm_stages)
+        mse_stages = [i for i in range(num_stages) if i not in ohkm_stages]
+
+        self.use_target_weight = use_target_weight
+        self.topk = topk
+        self.loss_weight = loss_weight
+        self.num_stages = num_stages
+        self.ohkm_stages = ohkm_stages
+        self.mse_stages = mse_stages
+        self.stage_weights = list(stage_weights)
+        compile_forward(self, compile)
+
+    def forward(self, output, target, target_weight):
+        """Forward function.
+
+        Note:
+            - batch_size: N
+            - num_outputs: O
+            - num_keypoints: K
+            - heatmaps height: H
+            - heatmaps weight: W
+
+        Args:
+            output (list[torch.Tensor[N,K,H,W]] | torch.Tensor[N,O,K,H,W]):
+                Output heatmaps of all stages.
+            target (torch.Tensor[N,O,K,H,W]): Target heatmaps.
+            target_weight (torch.Tensor[N,O,K,1]):
+                Weights across different joint types.
+        """
+        if isinstance(output, (list, tuple)):
+            output = torch.stack(output, dim=1)
+        batch_size, num_stages, num_joints = output.shape[:3]
+        if num_stages != self.num_stages:
+            raise ValueError(f'Expect {self.num_stages} stages, '
+                             f'but got {num_stages}.')
+        if self.ohkm_stages and num_joints < self.topk:
+            raise ValueError(f'topk ({self.topk}) should not '
+                             f'larger than num_joints ({num_joints}).')
+
+        diff = (output - target).reshape(batch_size, num_stages, num_joints,
+                                         -1)
+        # [N, O, K]
+        joint_losses = diff.pow(2).mean(dim=-1)
+        if self.use_target_weight:
+            # weight the per-joint losses instead of the full heatmaps
+            joint_losses = joint_losses * target_weight.reshape(
+                batch_size, num_stages, num_joints).pow(2)
+
+        stage_weights = joint_losses.new_tensor(self.stage_weights)
+        loss = 0.
+        if self.mse_stages:
+            mse_losses = joint_losses[:, self.mse_stages].mean(dim=(0, 2))
+            loss += (mse_losses * stage_weights[self.mse_stages]).sum()
+        if self.ohkm_stages:
+            hard_losses, _ = joint_losses[:, self.ohkm_stages].topk(
+                self.topk, dim=-1, sorted=False)
+            ohkm_losses = hard_losses.mean(dim=(0, 2))
+            loss += (ohkm_losses * stage_weights[self.ohkm_stages]).sum()
+
+        return loss * self.loss_weight
@@ -170,7 +170,10 @@ class WingLoss(nn.Module):
             pred (torch.Tensor[N, K, D]): Output regression.
             target (torch.Tensor[N, K, D]): Target regression.
         """
-        delta = (target - pred).abs()
+        return self._wing((target - pred).abs())
+
+    def _wing(self, delta):
+        """Wing loss of the absolute errors ``delta`` [N, K, D]."""
         losses = torch.where(
             delta < self.omega,
             self.omega * torch.log(1.0 + delta / self.epsilon), delta - self.C)
@@ -192,8 +195,8 @@ class WingLoss(nn.Module):
         """
         if self.use_target_weight:
             assert target_weight is not None
-            loss = self.criterion(output * target_weight,
-                                  target * target_weight)
+            # weight the difference once instead of both coordinates
+            loss = self._wing(((output - target) * target_weight).abs())
         else:
             loss = self.criterion(output, target)
 
@@ -248,7 +251,10 @@ class SoftWingLoss(nn.Module):
             pred (torch.Tensor[N, K, D]): Output regression.
             target (torch.Tensor[N, K, D]): Target regression.
         """
-        delta = (target - pred).abs()
+        return self._soft_wing((target - pred).abs())
+
+    def _soft_wing(self, delta):
+        """Soft wing loss of the absolute errors ``delta`` [N, K, D]."""
         losses = torch.where(
             delta < self.omega1, delta,
             self.omega2 * torch.log(1.0 + delta / self.epsilon) + self.B)
@@ -270,8 +276,8 @@ class SoftWingLoss(nn.Module):
         """
         if self.use_target_weight:
             assert target_weight is not None
-            loss = self.criterion(output * target_weight,
-                                  target * target_weight)
+            # weight the difference once instead of both coordinates
+            loss = self._soft_wing(((output - target) * target_weight).abs())
         else:
             loss = self.criterion(output, target)
 
@@ -343,8 +349,9 @@ class L1Loss(nn.Module):
         """
         if self.use_target_weight:
             assert target_weight is not None
-            loss = self.criterion(output * target_weight,
-                                  target * target_weight)
+            # weight the difference once instead of both coordinates
+            diff = (output - target) * target_weight
+            loss = diff.abs().mean()
         else:
             loss = self.criterion(output, target)
 
@@ -376,8 +383,9 @@ class MSELoss(nn.Module):
         """
         if self.use_target_weight:
             assert target_weight is not None
-            loss = self.criterion(output * target_weight,
-                                  target * target_weight)
+            # weight the difference once instead of both coordinates
+            diff = (output - target) * target_weight
+            loss = diff.pow(2).mean()
         else:
             loss = self.criterion(output, target)
 
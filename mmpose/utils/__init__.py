@@ -3,7 +3,9 @@ from .collect_env import collect_env
 from .logger import get_root_logger
 from .setup_env import setup_multi_processes
 from .timer import StopWatch
+from .torch_compile import compile_forward, compile_model
 
 __all__ = [
-    'get_root_logger', 'collect_env', 'StopWatch', 'setup_multi_processes'
+    'get_root_logger', 'collect_env', 'StopWatch', 'setup_multi_processes',
+    'compile_model', 'compile_forward'
 ]
@@ -25,9 +25,12 @@ def setup_multi_processes(cfg):
     opencv_num_threads = cfg.get('opencv_num_threads', 0)
     cv2.setNumThreads(opencv_num_threads)
 
+    workers_per_gpu = cfg.data.get('workers_per_gpu', 1)
+    use_workers = workers_per_gpu == 'auto' or workers_per_gpu > 1
+
     # setup OMP threads
     # This code is referred from https://github.com/pytorch/pytorch/blob/master/torch/distributed/run.py  # noqa
-    if 'OMP_NUM_THREADS' not in os.environ and cfg.data.workers_per_gpu > 1:
+    if 'OMP_NUM_THREADS' not in os.environ and use_workers:
         omp_num_threads = 1
         warnings.warn(
             f'Setting OMP_NUM_THREADS environment variable for each process '
@@ -37,7 +40,7 @@ def setup_multi_processes(cfg):
         os.environ['OMP_NUM_THREADS'] = str(omp_num_threads)
 
     # setup MKL threads
-    if 'MKL_NUM_THREADS' not in os.environ and cfg.data.workers_per_gpu > 1:
+    if 'MKL_NUM_THREADS' not in os.environ and use_workers:
         mkl_num_threads = 1
         warnings.warn(
             f'Setting MKL_NUM_THREADS environment variable for each process '
@@ -0,0 +1,66 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import warnings
+
+import torch
+from mmcv.utils import digit_version
+
+
+def compile_model(model, compile_cfg):
+    """Compile the backbone, neck and keypoint head of a pose model with
+    ``torch.compile``.
+
+    Only the ``forward`` of these sub-modules is compiled, so that the python
+    logic of the detector (loss computation, decoding, flip test, etc.) stays
+    in eager mode and the parameter names in the state dict are unchanged.
+
+    Args:
+        model (nn.Module): The pose model to compile.
+        compile_cfg (bool | dict): ``True`` to compile with the default
+            arguments, or the keyword arguments of :func:`torch.compile`,
+            e.g. ``dict(mode='max-autotune')``. Falsy values keep the model
+            in eager mode.
+
+    Returns:
+        nn.Module: The model whose sub-modules are compiled in place.
+    """
+    if not compile_cfg:
+        return model
+
+    if digit_version(torch.__version__) < digit_version('2.0.0'):
+        warnings.warn('`compile` requires PyTorch >= 2.0.0, but got '
+                      f'{torch.__version__}. The model is run in eager mode.')
+        return model
+
+    for name in ('backbone', 'neck', 'keypoint_head'):
+        module = getattr(model, name, None)
+        if module is not None:
+            compile_forward(module, compile_cfg)
+
+    return model
+
+
+def compile_forward(module, compile_cfg):
+    """Compile the ``forward`` of a module in place with ``torch.compile``.
+
+    Args:
+        module (nn.Module): The module to compile.
+        compile_cfg (bool | dict): ``True`` to compile with the default
+            arguments, or the keyword arguments of :func:`torch.compile`.
+            Falsy values keep the module in eager mode.
+
+    Returns:
+        nn.Module: The module whose ``forward`` is compiled.
+    """
+    if not compile_cfg:
+        return module
+
+    if digit_version(torch.__version__) < digit_version('2.0.0'):
+        warnings.warn('`compile` requires PyTorch >= 2.0.0, but got '
+                      f'{torch.__version__}. The model is run in eager mode.')
+        return module
+
+    if not isinstance(compile_cfg, dict):
+        compile_cfg = dict()
+
+    module.forward = torch.compile(module.forward, **compile_cfg)
+    return module
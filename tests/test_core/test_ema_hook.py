@@ -0,0 +1,37 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import copy
+from types import SimpleNamespace
+
+import torch
+from mmcv.runner import EMAHook
+
+from mmpose.core import ForeachEMAHook
+
+
+def test_foreach_ema_hook():
+    torch.manual_seed(0)
+    model = torch.nn.Sequential(
+        torch.nn.Conv2d(3, 4, 3), torch.nn.BatchNorm2d(4),
+        torch.nn.Conv2d(4, 2, 1))
+    ref_model = copy.deepcopy(model)
+
+    hook = ForeachEMAHook(momentum=0.1, warm_up=2)
+    ref_hook = EMAHook(momentum=0.1, warm_up=2)
+    runner = SimpleNamespace(model=model, iter=0)
+    ref_runner = SimpleNamespace(model=ref_model, iter=0)
+    hook.before_run(runner)
+    ref_hook.before_run(ref_runner)
+
+    for i in range(3):
+        runner.iter = ref_runner.iter = i
+        with torch.no_grad():
+            for p, ref_p in zip(model.parameters(), ref_model.parameters()):
+                noise = torch.rand_like(p)
+                p.add_(noise)
+                ref_p.add_(noise)
+        hook.after_train_iter(runner)
+        ref_hook.after_train_iter(ref_runner)
+
+    buffers = dict(model.named_buffers())
+    for name, ref_buffer in ref_model.named_buffers():
+        assert torch.allclose(buffers[name], ref_buffer)
@@ -1,7 +1,7 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 from mmcv import Config
 
-from mmpose.datasets.builder import build_dataset
+from mmpose.datasets.builder import build_dataset, get_auto_workers_per_gpu
 
 
 def test_concat_dataset():
@@ -65,3 +65,11 @@ def test_concat_dataset():
         concat_dataset_cfg['data_cfg'][key] = [val] * 2
     concat_dataset = build_dataset(concat_dataset_cfg)
     assert len(concat_dataset) == 2 * len(dataset)
+
+
+def test_get_auto_workers_per_gpu():
+    num_workers = get_auto_workers_per_gpu(num_gpus=1, dist=False)
+    assert 1 <= num_workers <= 8
+    assert get_auto_workers_per_gpu(num_gpus=1, dist=False, max_workers=1) == 1
+    # the CPUs are shared by more GPUs than there are CPUs
+    assert get_auto_workers_per_gpu(num_gpus=100000, dist=False) == 1
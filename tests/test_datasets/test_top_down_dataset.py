@@ -1,5 +1,7 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import copy
+import os.path as osp
+import tempfile
 from unittest.mock import MagicMock
 
 import pytest
@@ -89,6 +91,64 @@ def test_top_down_COCO_dataset():
     with pytest.raises(KeyError):
         _ = custom_dataset.evaluate(results, metric='PCK')
 
+    # Test annotation cache
+    with tempfile.TemporaryDirectory() as tmpdir:
+        ann_cache = osp.join(tmpdir, 'cache', 'test_coco.pkl')
+        for i in range(2):
+            cached_dataset = dataset_class(
+                ann_file='tests/data/coco/test_coco.json',
+                img_prefix='tests/data/coco/',
+                data_cfg=data_cfg,
+                pipeline=[],
+                dataset_info=dataset_info,
+                test_mode=True,
+                ann_cache=ann_cache)
+            assert osp.exists(ann_cache)
+            assert len(cached_dataset.db) == len(custom_dataset.db)
+            assert_almost_equal(cached_dataset.db[0]['joints_3d'],
+                                custom_dataset.db[0]['joints_3d'])
+            assert cached_dataset.img_ids == custom_dataset.img_ids
+            assert cached_dataset.id2name == custom_dataset.id2name
+            if i == 1:
+                # the annotation file is not parsed on a cache hit
+                assert 'coco' not in vars(cached_dataset)
+                assert cached_dataset._coco is None
+
+        # the cache is rebuilt for another image prefix
+        with pytest.warns(UserWarning):
+            cached_dataset = dataset_class(
+                ann_file='tests/data/coco/test_coco.json',
+                img_prefix='tests/data/coco_other/',
+                data_cfg=data_cfg,
+                pipeline=[],
+                dataset_info=dataset_info,
+                test_mode=True,
+                ann_cache=ann_cache)
+        assert cached_dataset.db[0]['image_file'].startswith(
+            'tests/data/coco_other/')
+
+        # an unwritable cache only raises a warning
+        with pytest.warns(UserWarning):
+            _ = dataset_class(
+                ann_file='tests/data/coco/test_coco.json',
+                img_prefix='tests/data/coco/',
+                data_cfg=data_cfg,
+                pipeline=[],
+                dataset_info=dataset_info,
+                test_mode=True,
+                ann_cache=osp.join(ann_cache, 'test_coco.pkl'))
+
+        # the cache is rebuilt for detected bboxes
+        with pytest.warns(UserWarning):
+            _ = dataset_class(
+                ann_file='tests/data/coco/test_coco.json',
+                img_prefix='tests/data/coco/',
+                data_cfg=data_cfg_copy,
+                pipeline=[],
+                dataset_info=dataset_info,
+                test_mode=True,
+                ann_cache=ann_cache)
+
     # Test when gt annotations are absent
     del custom_dataset.coco.dataset['annotations']
     with pytest.warns(UserWarning):
@@ -1,6 +1,7 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import pytest
 import torch
+from mmcv.utils import digit_version
 
 from mmpose.models import build_loss
 
@@ -71,6 +72,21 @@ def test_mse_loss():
     fake_label = torch.zeros((1, 3, 64, 64))
     assert torch.allclose(loss(fake_pred, fake_label, None), torch.tensor(0.5))
 
+    loss_cfg = dict(type='JointsOHKMMSELoss', use_target_weight=True, topk=2)
+    loss = build_loss(loss_cfg)
+    fake_pred = torch.ones((2, 3, 64, 64))
+    fake_label = torch.zeros((2, 3, 64, 64))
+    target_weight = torch.tensor([[1., 0., 0.], [1., 1., 0.]]).view(2, 3, 1)
+    assert torch.allclose(
+        loss(fake_pred, fake_label, target_weight), torch.tensor(0.75))
+
+    # the weight is applied to both heatmaps, i.e. squared in the loss
+    fake_pred = torch.ones((1, 3, 64, 64))
+    fake_label = torch.zeros((1, 3, 64, 64))
+    target_weight = torch.tensor([0.5, 1., 0.]).view(1, 3, 1)
+    assert torch.allclose(
+        loss(fake_pred, fake_label, target_weight), torch.tensor(0.625))
+
     loss_cfg = dict(type='CombinedTargetMSELoss', use_target_weight=True)
     loss = build_loss(loss_cfg)
     fake_pred = torch.ones((1, 3, 64, 64))
@@ -87,6 +103,51 @@ def test_mse_loss():
     assert torch.allclose(
         loss(fake_pred, fake_label, target_weight), torch.tensor(0.))
 
+    # test the fused multi-stage loss against per-stage losses
+    stage_weights = ([0.25] * 3 + [1.]) * 2
+    loss = build_loss(
+        dict(
+            type='JointsMultiStageMSELoss',
+            use_target_weight=True,
+            stage_weights=stage_weights,
+            ohkm_stages=[3, 7],
+            topk=2))
+    stage_losses = []
+    for i, weight in enumerate(stage_weights):
+        if i in [3, 7]:
+            stage_loss_cfg = dict(type='JointsOHKMMSELoss', topk=2)
+        else:
+            stage_loss_cfg = dict(type='JointsMSELoss')
+        stage_losses.append(
+            build_loss(
+                dict(
+                    use_target_weight=True,
+                    loss_weight=weight,
+                    **stage_loss_cfg)))
+    fake_pred = [torch.rand((2, 3, 8, 8)) for _ in range(8)]
+    fake_label = torch.rand((2, 8, 3, 8, 8))
+    target_weight = torch.randint(0, 2, (2, 8, 3, 1)).float()
+    expected = sum(
+        stage_loss(fake_pred[i], fake_label[:, i], target_weight[:, i])
+        for i, stage_loss in enumerate(stage_losses))
+    assert torch.allclose(loss(fake_pred, fake_label, target_weight), expected)
+
+    with pytest.raises(ValueError):
+        loss(fake_pred[:4], fake_label[:, :4], target_weight[:, :4])
+
+    # test compiled loss
+    if digit_version(torch.__version__) >= digit_version('2.0.0'):
+        loss_cfg = dict(type='JointsMSELoss', use_target_weight=True)
+        loss = build_loss(loss_cfg)
+        compiled_loss = build_loss(
+            dict(loss_cfg, compile=dict(backend='eager')))
+        fake_pred = torch.rand((2, 3, 8, 8))
+        fake_label = torch.rand((2, 3, 8, 8))
+        target_weight = torch.rand((2, 3, 1))
+        assert torch.allclose(
+            compiled_loss(fake_pred, fake_label, target_weight),
+            loss(fake_pred, fake_label, target_weight))
+
 
 def test_smoothl1_loss():
     # test MSE loss without target weight
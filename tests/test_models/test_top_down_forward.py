@@ -275,6 +275,21 @@ def test_topdown_forward():
     with torch.no_grad():
         _ = detector.forward(imgs, img_metas=img_metas, return_loss=False)
 
+    # channels last
+    detector = TopDown(
+        model_cfg['backbone'],
+        model_cfg['neck'],
+        model_cfg['keypoint_head'],
+        model_cfg['train_cfg'],
+        model_cfg['test_cfg'],
+        model_cfg['pretrained'],
+        channels_last=True)
+    assert detector.backbone.conv1.weight.is_contiguous(
+        memory_format=torch.channels_last)
+
+    with torch.no_grad():
+        _ = detector.forward(imgs, img_metas=img_metas, return_loss=False)
+
 
 def test_posewarper_forward():
     # test PoseWarper
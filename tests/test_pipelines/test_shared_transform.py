@@ -1,9 +1,11 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import copy
 import os.path as osp
 
 import numpy as np
 import pytest
 from mmcv import bgr2rgb, build_from_cfg
+from numpy.testing import assert_array_almost_equal
 
 from mmpose.datasets import PIPELINES
 from mmpose.datasets.pipelines import Compose
@@ -78,6 +80,13 @@ def test_load_image_from_file():
     results = load(results)
     assert results['img'].shape == (425, 640, 3)
 
+    # loading with another decoding backend
+    load_pillow = build_from_cfg(
+        dict(type='LoadImageFromFile', imdecode_backend='pillow'), PIPELINES)
+    results_pillow = load_pillow(dict(image_file=image_file))
+    assert results_pillow['img'].shape == (425, 640, 3)
+    assert "imdecode_backend='pillow'" in repr(load_pillow)
+
     # load a single image from a list
     image_file = [osp.join(data_prefix, '000000000785.jpg')]
     results = dict(image_file=image_file)
@@ -216,3 +225,32 @@ def test_rename_keys():
     assert 'target_weight' in results
     assert results['target'].shape == (17, 3)
     assert results['target_weight'].shape == (17, 3)
+
+
+def test_normalize_lut():
+    data_prefix = 'tests/data/coco/'
+    results = dict(image_file=osp.join(data_prefix, '000000000785.jpg'))
+    load = build_from_cfg(dict(type='LoadImageFromFile'), PIPELINES)
+    results = load(results)
+
+    norm_cfg = dict(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
+    to_tensor = build_from_cfg(dict(type='ToTensor'), PIPELINES)
+    normalize = build_from_cfg(
+        dict(type='NormalizeTensor', **norm_cfg), PIPELINES)
+    normalize_lut = build_from_cfg(
+        dict(type='NormalizeLUT', **norm_cfg), PIPELINES)
+
+    # uint8 images use the lookup table
+    results_ref = normalize(to_tensor(copy.deepcopy(results)))
+    results_lut = normalize_lut(copy.deepcopy(results))
+    assert results_lut['img'].dtype == results_ref['img'].dtype
+    assert results_lut['img'].shape == results_ref['img'].shape
+    assert_array_almost_equal(results_lut['img'].numpy(),
+                              results_ref['img'].numpy())
+
+    # float images and lists of images
+    results['img'] = [results['img'], results['img'].astype(np.float32)]
+    results_ref = normalize(to_tensor(copy.deepcopy(results)))
+    results_lut = normalize_lut(copy.deepcopy(results))
+    for img_lut, img_ref in zip(results_lut['img'], results_ref['img']):
+        assert_array_almost_equal(img_lut.numpy(), img_ref.numpy())
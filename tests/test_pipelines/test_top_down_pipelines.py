@@ -5,7 +5,7 @@ import warnings
 
 import numpy as np
 import torch
-from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_array_almost_equal, assert_array_equal
 from xtcocotools.coco import COCO
 
 from mmpose.datasets.pipelines import (Collect, LoadImageFromFile,
@@ -130,6 +130,23 @@ def test_top_down_pipeline():
     results_flip = random_flip(copy.deepcopy(results))
     assert _check_flip(results['img'], results_flip['img'])
 
+    # test deferred flip, which is folded into the affine warp
+    affine_transform = TopDownAffine()
+    results_rot = copy.deepcopy(results)
+    results_rot['rotation'] = 30
+    results_flip = affine_transform(random_flip(copy.deepcopy(results_rot)))
+    random_flip = TopDownRandomFlip(flip_prob=1., defer_img_flip=True)
+    results_deferred = random_flip(copy.deepcopy(results_rot))
+    assert results_deferred['img_flip_deferred']
+    assert_array_equal(results_deferred['img'], results['img'])
+    results_deferred = affine_transform(results_deferred)
+    assert 'img_flip_deferred' not in results_deferred
+    assert_array_almost_equal(results_deferred['joints_3d'],
+                              results_flip['joints_3d'])
+    diff = np.abs(results_deferred['img'].astype(np.float32) -
+                  results_flip['img'].astype(np.float32))
+    assert diff.mean() < 1
+
     # test random scale and rotate
     random_scale_rotate = TopDownGetRandomScaleRotation(90, 0.3, 1.0)
     results_scale_rotate = random_scale_rotate(copy.deepcopy(results))
@@ -6,12 +6,16 @@ import time
 
 import cv2
 import mmcv
+import pytest
 import torch
 import torchvision
 from mmcv import Config
+from mmcv.utils import digit_version
 
 import mmpose
-from mmpose.utils import StopWatch, collect_env, setup_multi_processes
+from mmpose.models import build_posenet
+from mmpose.utils import (StopWatch, collect_env, compile_model,
+                          setup_multi_processes)
 
 
 def test_collect_env():
@@ -69,6 +73,13 @@ def test_setup_multi_processes():
     assert 'OMP_NUM_THREADS' not in os.environ
     assert 'MKL_NUM_THREADS' not in os.environ
 
+    # test automatic num workers
+    config = dict(data=dict(workers_per_gpu='auto'))
+    cfg = Config(config)
+    setup_multi_processes(cfg)
+    assert os.getenv('OMP_NUM_THREADS') == '1'
+    assert os.getenv('MKL_NUM_THREADS') == '1'
+
     # test manually set env var
     os.environ['OMP_NUM_THREADS'] = '4'
     config = dict(data=dict(workers_per_gpu=2))
@@ -98,3 +109,39 @@ def test_setup_multi_processes():
         os.environ['MKL_NUM_THREADS'] = sys_mkl_threads
     else:
         os.environ.pop('MKL_NUM_THREADS')
+
+
+def test_compile_model():
+    model_cfg = dict(
+        type='TopDown',
+        backbone=dict(type='ResNet', depth=18),
+        keypoint_head=dict(
+            type='TopdownHeatmapSimpleHead',
+            in_channels=512,
+            out_channels=17,
+            loss_keypoint=dict(type='JointsMSELoss', use_target_weight=True)),
+        train_cfg=dict(),
+        test_cfg=dict(flip_test=False))
+    model = build_posenet(model_cfg)
+    img = torch.rand(1, 3, 64, 64)
+    with torch.no_grad():
+        expected = model.keypoint_head(model.backbone(img))
+
+    # disabled
+    forward = model.backbone.forward
+    assert compile_model(model, False) is model
+    assert model.backbone.forward == forward
+
+    if digit_version(torch.__version__) < digit_version('2.0.0'):
+        with pytest.warns(UserWarning):
+            compile_model(model, True)
+        assert model.backbone.forward == forward
+        return
+
+    state_dict_keys = list(model.state_dict().keys())
+    model = compile_model(model, dict(backend='eager'))
+    assert model.backbone.forward != forward
+    assert list(model.state_dict().keys()) == state_dict_keys
+    with torch.no_grad():
+        output = model.keypoint_head(model.backbone(img))
+    assert torch.allclose(output, expected)
@@ -36,6 +36,11 @@ def main():
     if cfg.get('cudnn_benchmark', False):
         torch.backends.cudnn.benchmark = True
 
+    # allow TF32 on Ampere or newer GPUs
+    if cfg.get('allow_tf32', False):
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.allow_tf32 = True
+
     # build the dataloader
     dataset = build_dataset(cfg.data.val)
     data_loader = build_dataloader(
@@ -14,7 +14,7 @@ from mmcv.runner import get_dist_info, init_dist, load_checkpoint
 from mmpose.apis import multi_gpu_test, single_gpu_test
 from mmpose.datasets import build_dataloader, build_dataset
 from mmpose.models import build_posenet
-from mmpose.utils import setup_multi_processes
+from mmpose.utils import compile_model, setup_multi_processes
 
 try:
     from mmcv.runner import wrap_fp16_model
@@ -98,6 +98,11 @@ def main():
     # set cudnn_benchmark
     if cfg.get('cudnn_benchmark', False):
         torch.backends.cudnn.benchmark = True
+
+    # allow TF32 on Ampere or newer GPUs
+    if cfg.get('allow_tf32', False):
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.allow_tf32 = True
     cfg.model.pretrained = None
     cfg.data.test.test_mode = True
 
@@ -131,6 +136,7 @@ def main():
         **dict((k, cfg.data[k]) for k in [
                    'seed',
                    'prefetch_num',
+                   'prefetch_factor',
                    'pin_memory',
                    'persistent_workers',
                ] if k in cfg.data)
@@ -155,6 +161,11 @@ def main():
     if args.fuse_conv_bn:
         model = fuse_conv_bn(model)
 
+    # compile the model graph with torch.compile if required, using the
+    # evaluation specific settings when given
+    model = compile_model(model,
+                          cfg.get('compile_eval', cfg.get('compile', False)))
+
     if not distributed:
         model = MMDataParallel(model, device_ids=[args.gpu_id])
         outputs = single_gpu_test(model, data_loader)